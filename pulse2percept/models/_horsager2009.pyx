@@ -57,7 +57,7 @@ cpdef temporal_fast(const float32[:, ::1] stim,
     """
     cdef:
         float32 ca, r1, r2, r3_a, r3, r4a, r4b, r4c
-        float32 t_sim, amp
+        float32 t_sim, amp, dt_tau1, dt_tau2, dt_tau3
         float32[:, ::1] percept
         int32 idx_space, idx_sim, idx_stim, idx_frame
         int32 n_space, n_stim, n_percept, n_sim
@@ -65,6 +65,12 @@ cpdef temporal_fast(const float32[:, ::1] stim,
     # Note that eps must be divided by 1000, because the original model was fit
     # with a microsecond time step and now we are running milliseconds:
     eps = eps / 1000.0
+    # Every stage of the cascade is a leaky integrator of the form
+    # r = r + dt * (x - r) / tau. The step sizes dt / tau are constant, so we
+    # compute them once instead of dividing at every time step:
+    dt_tau1 = dt / tau1
+    dt_tau2 = dt / tau2
+    dt_tau3 = dt / tau3
 
     n_percept = len(idx_t_percept)  # Py overhead
     n_stim = len(t_stim)  # Py overhead
@@ -101,19 +107,19 @@ cpdef temporal_fast(const float32[:, ::1] stim,
             # which is required to reproduce e.g. Fig.3 in the paper,
             # indicating that the model was trained on what we know call
             # "anodic" current:
-            r1 = r1 + dt * (-amp - r1) / tau1  # += in threads is a reduction
+            r1 = r1 + dt_tau1 * (-amp - r1)  # += in threads is a reduction
             # Charge accumulation:
             # ca = ca + dt * c_fmax(amp, 0) # SLOW
             ca = ca + dt * (amp if amp > 0.0 else 0.0)
-            r2 = r2 + dt * (ca - r2) / tau2
+            r2 = r2 + dt_tau2 * (ca - r2)
             # Half-rectification and power nonlinearity:
             # r3 = c_pow(c_fmax(r1 - eps * r2, 0), beta) # SLOW
             r3_a = r1 - eps * r2
             r3 = c_pow((r3_a if r3_a > 0.0 else 0.0), beta)
             # Slow response (3-stage leaky integrator):
-            r4a = r4a + dt * (r3 - r4a) / tau3
-            r4b = r4b + dt * (r4a - r4b) / tau3
-            r4c = r4c + dt * (r4b - r4c) / tau3
+            r4a = r4a + dt_tau3 * (r3 - r4a)
+            r4b = r4b + dt_tau3 * (r4a - r4b)
+            r4c = r4c + dt_tau3 * (r4b - r4c)
             if idx_sim == idx_t_percept[idx_frame]:
                 # `idx_t_percept` stores the time points at which we need to
                 # output a percept. We compare `idx_sim` to `idx_t_percept`
@@ -53,54 +53,46 @@ cpdef spatial_fast(const float32[:, ::1] stim,
 
     """
     cdef:
-        int32 idx_el, idx_time, idx_space, idx_bright
-        int32 n_el, n_time, n_space, n_bright
-        float32[:, ::1] bright
-        float32 px_bright, denom, d2c, d2e, amp
+        int32 idx_el, idx_space
+        int32 n_el, n_space
+        float32[:, ::1] atten
+        float32 denom, d2c, d2e
 
     n_el = stim.shape[0]
-    n_time = stim.shape[1]
     n_space = len(xgrid)
-    n_bright = n_time * n_space
 
-    # A flattened array containing n_time x n_space entries:
-    bright = np.empty((n_space, n_time), dtype=np.float32)  # Py overhead
-
-    for idx_bright in prange(n_bright, schedule='static', nogil=True, num_threads=n_threads):
-        # For each entry in the output matrix:
-        idx_space = idx_bright % n_space
-        idx_time = idx_bright / n_space
+    # The current spread from an electrode to a pixel does not depend on time,
+    # so we calculate the attenuation for each (pixel, electrode) pair once:
+    atten = np.zeros((n_space, n_el), dtype=np.float32)  # Py overhead
 
+    for idx_space in prange(n_space, schedule='static', nogil=True, num_threads=n_threads):
         if c_isnan(xgrid[idx_space]) or c_isnan(ygrid[idx_space]):
-            bright[idx_space, idx_time] = 0.0
+            # Leave the row at zero:
             continue
-
-        # At each pixel to be rendered, we need to sum up the contribution of
-        # each electrode:
-        px_bright = 0.0
         for idx_el in range(n_el):
-            amp = stim[idx_el, idx_time]
-            if c_abs(amp) > 0:
-                # Calculate current spread for this electrode, given by the
-                # distance to the electrode center (`d2c`) and an exponential
-                # attenuation:
-                d2c = (c_pow(xgrid[idx_space] - xel[idx_el], 2) +
-                       c_pow(ygrid[idx_space] - yel[idx_el], 2))
-                if d2c < c_pow(rel[idx_el], 2):
-                    # On the electrode surface:
-                    denom = atten_a + c_pow(zel[idx_el], atten_n)
-                else:
-                    # Away from the electrode surface, calculate the distance
-                    # to the electrode egde (`d2e`):
-                    d2e = (c_pow(c_sqrt(d2c) - rel[idx_el], 2) +
-                           c_pow(zel[idx_el], 2))
-                    denom = atten_a + c_pow(c_sqrt(d2e), atten_n)
-                # Add the contribution of this electrode to the px brightness:
-                px_bright = px_bright + amp * atten_a / denom
-        if c_abs(px_bright) < thresh_percept:
-            px_bright = 0.0
-        bright[idx_space, idx_time] = px_bright
-    return np.asarray(bright)  # Py overhead
+            # Calculate current spread for this electrode, given by the
+            # distance to the electrode center (`d2c`) and an exponential
+            # attenuation:
+            d2c = (c_pow(xgrid[idx_space] - xel[idx_el], 2) +
+                   c_pow(ygrid[idx_space] - yel[idx_el], 2))
+            if d2c < c_pow(rel[idx_el], 2):
+                # On the electrode surface:
+                denom = atten_a + c_pow(zel[idx_el], atten_n)
+            else:
+                # Away from the electrode surface, calculate the distance
+                # to the electrode egde (`d2e`):
+                d2e = (c_pow(c_sqrt(d2c) - rel[idx_el], 2) +
+                       c_pow(zel[idx_el], 2))
+                denom = atten_a + c_pow(c_sqrt(d2e), atten_n)
+            atten[idx_space, idx_el] = atten_a / denom
+
+    # At each pixel to be rendered, we need to sum up the contribution of
+    # each electrode. This is a linear combination of the stimulus rows, which
+    # we can calculate for all pixels and time points with a single
+    # (space x electrodes) @ (electrodes x time) matrix multiplication:
+    bright = np.dot(np.asarray(atten), np.asarray(stim))  # Py overhead
+    bright[np.abs(bright) < thresh_percept] = 0.0  # Py overhead
+    return bright
 
 
 @cdivision(True)
@@ -160,7 +152,7 @@ cpdef temporal_fast(const float32[:, ::1] stim,
     """
     cdef:
         float32 ca, r1, r2, r3, max_r3, r4a, r4b, r4c
-        float32 t_sim, amp, scale
+        float32 t_sim, amp, scale, dt_tau1, dt_tau2, dt_tau3
         float32[:, ::1] all_r3
         float32[:, ::1] percept
         int32 idx_space, idx_sim, idx_stim, idx_frame
@@ -169,6 +161,12 @@ cpdef temporal_fast(const float32[:, ::1] stim,
     # Note that eps must be divided by 1000, because the original model was fit
     # with a microsecond time step and now we are running milliseconds:
     eps = eps / 1000.0
+    # Every stage of the cascade is a leaky integrator of the form
+    # r = r + dt * (x - r) / tau. The step sizes dt / tau are constant, so we
+    # compute them once instead of dividing at every time step:
+    dt_tau1 = dt / tau1
+    dt_tau2 = dt / tau2
+    dt_tau3 = dt / tau3
 
     n_percept = len(idx_t_percept)  # Py overhead
     n_stim = len(t_stim)  # Py overhead
@@ -200,11 +198,11 @@ cpdef temporal_fast(const float32[:, ::1] stim,
                     idx_stim = idx_stim + 1
             amp = stim[idx_space, idx_stim]
             # Fast ganglion cell response:
-            r1 = r1 + dt * (amp - r1) / tau1  # += in threads is a reduction
+            r1 = r1 + dt_tau1 * (amp - r1)  # += in threads is a reduction
             # Charge accumulation:
             # ca = ca + dt * c_fmax(amp, 0.0) # SLOW
             ca = ca + dt * (amp if amp > 0.0 else 0.0)
-            r2 = r2 + dt * (ca - r2) / tau2
+            r2 = r2 + dt_tau2 * (ca - r2)
             # Half-rectification:
             # r3 = c_fmax(r1 - eps * r2, 0.0) # SLOW
             r3 = r1 - eps * r2
@@ -220,21 +218,19 @@ cpdef temporal_fast(const float32[:, ::1] stim,
         r4a = 0.0
         r4b = 0.0
         r4c = 0.0
-        idx_stim = 0
         idx_frame = 0
-        # Scaling factor depends on `max_r3` from Step 1:
+        # Scaling factor depends on `max_r3` from Step 1. The stationary
+        # nonlinearity thus boils down to a single multiplication per time
+        # step, which we fuse with the slow response:
         scale = asymptote * c_expit((max_r3 - shift) / slope) / max_r3
-        # We have to restart the loop over all simulation time steps from 0:
+        # We have to restart the loop over all simulation time steps from 0.
+        # Step 2 only reads `all_r3`, so there is no need to look up the
+        # stimulus frame again:
         for idx_sim in range(n_sim):
-            t_sim = idx_sim * dt
-            # Access the right stimulus frame (same as above):
-            if idx_stim + 1 < n_stim:
-                if t_sim >= t_stim[idx_stim + 1]:
-                    idx_stim = idx_stim + 1
             # Slow response (3-stage leaky integrator):
-            r4a = r4a + dt * (all_r3[idx_space, idx_sim] * scale - r4a) / tau3
-            r4b = r4b + dt * (r4a - r4b) / tau3
-            r4c = r4c + dt * (r4b - r4c) / tau3
+            r4a = r4a + dt_tau3 * (all_r3[idx_space, idx_sim] * scale - r4a)
+            r4b = r4b + dt_tau3 * (r4a - r4b)
+            r4c = r4c + dt_tau3 * (r4b - r4c)
             if idx_sim == idx_t_percept[idx_frame]:
                 # `idx_t_percept` stores the time points at which we need to
                 # output a percept. We compare `idx_sim` to `idx_t_percept`
@@ -170,13 +170,20 @@ class Nanduri2012Temporal(TemporalModel):
         if np.unique(idx_percept).size < t_percept.size:
             raise ValueError(f"All times 't_percept' must be distinct multiples "
                              f"of `dt`={self.dt:.2e}")
+        # Zero in = zero out: Only spatial locations that receive some input
+        # need to be passed through the model; all others stay zero:
+        active = np.any(stim_data != 0, axis=1)
+        percept = np.zeros((stim_data.shape[0], t_percept.size),
+                           dtype=np.float32)
         # Cython returns a 2D (space x time) NumPy array:
-        return temporal_fast(stim_data.astype(np.float32),
-                             stim.time.astype(np.float32),
-                             idx_percept,
-                             self.dt, self.tau1, self.tau2, self.tau3,
-                             self.asymptote, self.shift, self.slope, self.eps,
-                             self.scale_out, self.thresh_percept, self.n_threads)
+        percept[active] = temporal_fast(
+            np.ascontiguousarray(stim_data[active], dtype=np.float32),
+            stim.time.astype(np.float32), idx_percept,
+            self.dt, self.tau1, self.tau2, self.tau3,
+            self.asymptote, self.shift, self.slope, self.eps,
+            self.scale_out, self.thresh_percept, self.n_threads
+        )
+        return percept
 
 
 class Nanduri2012Model(Model):
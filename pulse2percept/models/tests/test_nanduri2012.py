@@ -123,6 +123,19 @@ def test_Nanduri2012Temporal(scale_out):
     npt.assert_equal(percept.shape, (16, 1, 3))
     npt.assert_almost_equal(percept.data, 0)
 
+    # Silent pixels do not affect the response of active ones:
+    stim = BiphasicPulseTrain(20, 20, 0.45, interphase_dur=0.45, stim_dur=100)
+    data = np.zeros((2, 2, stim.data.shape[-1]))
+    data[0, 0] = data[1, 1] = stim.data
+    percept = model.predict_percept(Percept(data, time=stim.time),
+                                    t_percept=[0, 50, 100])
+    single = model.predict_percept(stim, t_percept=[0, 50, 100])
+    npt.assert_equal(percept.shape, (2, 2, 3))
+    npt.assert_almost_equal(percept.data[0, 0], single.data[0, 0])
+    npt.assert_almost_equal(percept.data[1, 1], single.data[0, 0])
+    npt.assert_almost_equal(percept.data[0, 1], 0)
+    npt.assert_almost_equal(percept.data[1, 0], 0)
+
     # Can't request the same time more than once (this would break the Cython
     # loop, because `idx_frame` is incremented after a write; also doesn't
     # make much sense):
@@ -29,6 +29,23 @@ def test_FadingTemporal():
     npt.assert_equal(isinstance(percept, Percept), True)
     npt.assert_equal(percept.shape, (1, 1, 3))
     npt.assert_almost_equal(percept.data, 0)
+    percept = model.predict_percept(Percept(np.zeros((2, 2, 6))),
+                                    t_percept=[0, 1, 2])
+    npt.assert_equal(percept.shape, (2, 2, 3))
+    npt.assert_almost_equal(percept.data, 0)
+
+    # Silent pixels do not affect the response of active ones:
+    stim = MonophasicPulse(-1, 1, stim_dur=10)
+    data = np.zeros((2, 2, stim.data.shape[-1]))
+    data[0, 0] = data[1, 1] = stim.data
+    percept = model.predict_percept(Percept(data, time=stim.time),
+                                    t_percept=[0, 1, 2])
+    single = model.predict_percept(stim, t_percept=[0, 1, 2])
+    npt.assert_equal(percept.shape, (2, 2, 3))
+    npt.assert_almost_equal(percept.data[0, 0], single.data[0, 0])
+    npt.assert_almost_equal(percept.data[1, 1], single.data[0, 0])
+    npt.assert_almost_equal(percept.data[0, 1], 0)
+    npt.assert_almost_equal(percept.data[1, 0], 0)
 
     # Can't request the same time more than once (this would break the Cython
     # loop, because `idx_frame` is incremented after a write; also doesn't
@@ -67,8 +67,9 @@ class GratingStimulus(VideoStimulus):
         direction = np.deg2rad(direction)
         phase = np.deg2rad(phase)
         height, width = shape
-        x = np.arange(width) - np.ceil(width / 2.0)
-        y = np.arange(height) - np.ceil(height / 2.0)
+        # Integer arithmetic for ceil(width / 2) and ceil(height / 2):
+        x = np.arange(width) - (width + 1) // 2
+        y = np.arange(height) - (height + 1) // 2
         if time is None:
             time = np.arange(0, 1001, 20)
         elif isinstance(time, (list, np.ndarray)):
@@ -181,30 +182,25 @@ class BarStimulus(VideoStimulus):
                                   temporal_freq=temporal_freq)
 
         bar = grating.data.reshape(grating.vid_shape)
-        for i in range(bar.shape[-1]):
-            frame = bar[..., i]
-            # There are 3 regions:
-            # - where stim should be one (center of the bar)
-            # - where stim should be zero (outside the bar)
-            # - where stim should be in between (edges of the bar)
-            bar_inner_th = np.cos(2 * np.pi * spatial_freq * half_width)
-            bar_outer_th = np.cos(2 * np.pi * spatial_freq * (half_width +
-                                                              edge_width))
-            bar_one = frame >= bar_inner_th
-            bar_edge = np.logical_and(frame < bar_inner_th,
-                                      frame > bar_outer_th)
-            bar_zero = frame <= bar_outer_th
-            # Set the regions to the appropriate level:
-            frame[bar_one] = 1.0
-            frame[bar_zero] = 0.0
-            # Adjust the range to [0, 2*pi):
-            frame[bar_edge] = np.arccos(frame[bar_edge])
-            # Adjust the range to [0, 1] spatial period:
-            frame[bar_edge] = frame[bar_edge] / (2 * np.pi * spatial_freq)
-            frame[bar_edge] = 0.5 * np.pi * (frame[bar_edge] - half_width)
-            frame[bar_edge] /= edge_width
-            frame[bar_edge] = np.cos(frame[bar_edge])
-            bar[..., i] = frame
+        # There are 3 regions:
+        # - where stim should be one (center of the bar)
+        # - where stim should be zero (outside the bar)
+        # - where stim should be in between (edges of the bar)
+        # The thresholds are the same for all frames, so we can process the
+        # whole video at once:
+        bar_inner_th = np.cos(2 * np.pi * spatial_freq * half_width)
+        bar_outer_th = np.cos(2 * np.pi * spatial_freq * (half_width +
+                                                          edge_width))
+        bar_one = bar >= bar_inner_th
+        bar_edge = np.logical_and(bar < bar_inner_th, bar > bar_outer_th)
+        bar_zero = bar <= bar_outer_th
+        # Adjust the range to [0, 2*pi), then to [0, 1] spatial period:
+        edge = np.arccos(bar[bar_edge]) / (2 * np.pi * spatial_freq)
+        edge = np.cos(0.5 * np.pi * (edge - half_width) / edge_width)
+        # Set the regions to the appropriate level:
+        bar[bar_one] = 1.0
+        bar[bar_zero] = 0.0
+        bar[bar_edge] = edge
 
         # Adjust to range [-1, 1]:
         bar = 2.0 * bar - 1.0
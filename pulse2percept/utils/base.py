@@ -3,7 +3,7 @@
 import numpy as np
 import sys
 import abc
-from scipy.special import factorial
+from math import factorial
 from collections import OrderedDict as ODict
 from functools import wraps
 from string import ascii_uppercase
@@ -303,12 +303,15 @@ def gamma(n, tau, tsample, tol=0.01):
     y /= np.trapz(np.abs(y), dx=tsample)
 
     # Cut off tail where values are smaller than `tol`.
-    # Make sure to start search on the right-hand side of the peak.
+    # Make sure to start search on the right-hand side of the peak. The kernel
+    # decays monotonically after the peak, so the first small value marks the
+    # end of the kernel:
     peak = y.argmax()
-    small_vals = np.where(y[peak:] < tol * y.max())[0]
-    if small_vals.size:
-        t = t[:small_vals[0] + peak]
-        y = y[:small_vals[0] + peak]
+    small = y[peak:] < tol * y[peak]
+    if small.any():
+        cutoff = peak + small.argmax()
+        t = t[:cutoff]
+        y = y[:cutoff]
 
     return t, y
 
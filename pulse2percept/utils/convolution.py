@@ -1,12 +1,24 @@
 """`conv`, `center_vector`"""
 
 import numpy as np
-from scipy import signal as sps
+from functools import lru_cache
+from scipy import fft as spfft, signal as sps
+
+# CuPy is optional. Rather than trying to import it all over, try once and then
+# remember by setting a flag.
+try:
+    import cupy
+    has_cupy = True
+except (ImportError, AttributeError):
+    has_cupy = False
 
 
 def center_vector(vec, newlen):
     """Returns the center ``newlen`` portion of a vector.
 
+    If ``vec`` has more than one dimension, the center portion is taken along
+    the last axis.
+
     Adapted from ``scipy.signal.signaltools._centered``:
     github.com/scipy/scipy/blob/v0.18.0/scipy/signal/signaltools.py#L236-L243
 
@@ -14,7 +26,7 @@ def center_vector(vec, newlen):
     currlen = vec.shape[-1]
     startind = (currlen - newlen) // 2
     endind = startind + newlen
-    return vec[startind:endind]
+    return vec[..., startind:endind]
 
 
 def _sparseconv(data, kernel, mode):
@@ -26,36 +38,172 @@ def _sparseconv(data, kernel, mode):
     Can run faster than ``np.convolve`` if:
     (1) ``data`` is much longer than ``kernel``
     (2) ``data`` is sparse (has lots of zeros)
+
+    If ``data`` is an N-D array, every row (last axis) is convolved with the
+    same 1D ``kernel``.
     """
     # NOTE Numba 0.44 has trouble with jitting nested functions when they
     # raise exceptions, so we don't raise ValueError here.
     kernel_len = kernel.size
-    data_len = data.size
-    out = np.zeros(data_len + kernel_len - 1)
+    data_len = data.shape[-1]
+    out = np.zeros(data.shape[:-1] + (data_len + kernel_len - 1,),
+                   dtype=np.result_type(data, kernel))
 
-    pos = np.where(data.ravel() != 0)[0]
-    # Add shifted and scaled copies of `kernel` only where `data` is nonzero
+    # A time point needs to be processed if any of the rows is nonzero there:
+    nonzero = data != 0
+    if data.ndim > 1:
+        nonzero = np.any(nonzero.reshape((-1, data_len)), axis=0)
+    pos = np.where(nonzero)[0]
+    # Add shifted and scaled copies of `kernel` only where `data` is nonzero.
+    # We reuse a scratch buffer for the scaled kernel and add it to `out` in
+    # place, so there are no temporary arrays in the loop:
+    kernel = kernel.ravel()
+    scaled = np.empty(out.shape[:-1] + (kernel_len,), dtype=out.dtype)
     for p in pos:
-        out[p:p + kernel_len] = (out[p:p + kernel_len] +
-                                 kernel.ravel() * data.ravel()[p])
+        np.multiply(kernel, data[..., p, None], out=scaled)
+        out[..., p:p + kernel_len] += scaled
+    return _crop_full(out, data_len, kernel_len, mode)
+
+
+@lru_cache(maxsize=4)
+def _rfft_kernel(kernel_bytes, dtype, n):
+    """Returns the (cached) real FFT of a kernel, zero-padded to length ``n``
+
+    Kernels such as the gamma functions used by temporal models do not change
+    between calls, so there is no need to transform them more than once.
+    Every entry holds a copy of the kernel and its FFT, so only a few of them
+    are kept.
+    """
+    kernel = np.frombuffer(kernel_bytes, dtype=dtype)
+    return spfft.rfft(kernel, n=n)
+
+
+def _fftconv(data, kernel, mode, workers=None, cache_kernel=False):
+    """Returns the FFT convolution of (rows of) ``data`` with a 1D ``kernel``
+
+    Same as ``scipy.signal.fftconvolve``, but the FFT size is rounded up to the
+    next fast length. If ``cache_kernel`` is True, the kernel FFT is cached
+    across calls. Rows are transformed in parallel using ``workers`` CPU
+    cores.
+    """
+    kernel = np.ascontiguousarray(kernel.ravel())
+    kernel_len = kernel.size
+    data_len = data.shape[-1]
+    full_len = data_len + kernel_len - 1
+    n = spfft.next_fast_len(full_len, real=True)
+    if cache_kernel:
+        fkernel = _rfft_kernel(kernel.tobytes(), kernel.dtype.str, n)
+    else:
+        fkernel = spfft.rfft(kernel, n=n)
+    out = spfft.irfft(spfft.rfft(data, n=n, axis=-1, workers=workers) *
+                      fkernel, n=n, axis=-1, workers=workers)[..., :full_len]
+    return _crop_full(out, data_len, kernel_len, mode)
+
+
+@lru_cache(maxsize=4)
+def _rfft_kernel_gpu(kernel_bytes, dtype, n):
+    """Returns the (cached) real FFT of a kernel on the GPU
+
+    Same as ``_rfft_kernel``, but the transformed kernel stays on the device,
+    so that it needs to be neither recomputed nor transferred again.
+    """
+    kernel = np.frombuffer(kernel_bytes, dtype=dtype)
+    return cupy.fft.rfft(cupy.asarray(kernel), n=n)
+
+
+def _gpuconv(data, kernel, mode, cache_kernel=False):
+    """Returns the FFT convolution of (rows of) ``data`` with a 1D ``kernel``
+
+    Same as ``_fftconv``, but the FFTs are computed on the GPU using CuPy.
+    All rows are transferred to the GPU at once and convolved in one batch.
+    """
+    if not has_cupy:
+        raise ImportError("You do not have `cupy` installed. Consider setting "
+                          "`method` to 'fft'.")
+    kernel = np.ascontiguousarray(kernel.ravel())
+    kernel_len = kernel.size
+    data_len = data.shape[-1]
+    full_len = data_len + kernel_len - 1
+    n = spfft.next_fast_len(full_len, real=True)
+    if cache_kernel:
+        fkernel = _rfft_kernel_gpu(kernel.tobytes(), kernel.dtype.str, n)
+    else:
+        fkernel = cupy.fft.rfft(cupy.asarray(kernel), n=n)
+    out = cupy.fft.irfft(cupy.fft.rfft(cupy.asarray(data), n=n, axis=-1) *
+                         fkernel, n=n, axis=-1)[..., :full_len]
+    return _crop_full(cupy.asnumpy(out), data_len, kernel_len, mode)
+
+
+def _crop_full(out, data_len, kernel_len, mode):
+    """Crops the 'full' convolution output ``out`` according to ``mode``"""
     if mode.lower() == 'full':
         return out
     elif mode.lower() == 'valid':
-        return center_vector(out, data_len - kernel_len + 1)
+        return center_vector(out, abs(data_len - kernel_len) + 1)
     elif mode.lower() == 'same':
         return center_vector(out, data_len)
 
 
-def conv(data, kernel, mode='full', method='fft'):
-    """Convoles data with a kernel using either FFT or sparse convolution
+@lru_cache(maxsize=32)
+def _choose_conv_method(data_shape, kernel_shape, dtype, mode):
+    """Returns the (cached) faster of 'direct' and 'fft' for the given sizes
+
+    ``scipy.signal.choose_conv_method`` only looks at the shapes and data
+    type of the inputs, so we can pass it zero-copy dummy arrays and remember
+    the decision for the next call with the same sizes.
+    """
+    zero = np.zeros(1, dtype=dtype)
+    return sps.choose_conv_method(np.broadcast_to(zero, data_shape),
+                                  np.broadcast_to(zero, kernel_shape),
+                                  mode=mode)
+
+
+def _auto_conv_method(data, kernel, mode, rowwise):
+    """Returns the convolution method to use for ``method='auto'``
 
-    This function convolves data with a kernel, relying either on the
-    fast Fourier transform (FFT) or a sparse convolution function.
+    The sparse convolution only adds up shifted copies of the kernel at the
+    time points where the data is nonzero. This beats the FFT if there are few
+    such time points (e.g., a pulse train), as long as the kernel is not too
+    long. It only supports a 1D kernel (``rowwise``). Otherwise, the faster
+    of 'direct' and 'fft' is used.
+    """
+    if rowwise and np.isrealobj(data) and data.ndim > 0:
+        data_len = data.shape[-1]
+        # Time points where any of the rows is nonzero:
+        n_nonzero = np.count_nonzero(np.any(data.reshape((-1, data_len)) != 0,
+                                            axis=0))
+        # The sparse method loops over the nonzero time points in Python, so
+        # the data must be really sparse, and the total number of operations
+        # must be smaller than for the FFT:
+        fft_len = data_len + kernel.size - 1
+        if (n_nonzero < 0.05 * data_len and
+                n_nonzero * kernel.size < fft_len * np.log2(fft_len)):
+            return 'sparse'
+    return _choose_conv_method(data.shape, kernel.shape, data.dtype.str, mode)
+
+
+def conv(data, kernel, mode='full', method='fft', workers=None,
+         cache_kernel=False):
+    """Convolves data with a kernel
+
+    This function convolves data with a kernel, relying either on direct
+    convolution, the fast Fourier transform (FFT) on the CPU or GPU,
+    overlap-add FFT convolution, or a sparse convolution function.
+
+    If ``data`` is an N-D array (e.g., space x time) and ``kernel`` is 1D,
+    every row of ``data`` is convolved with the same ``kernel`` along the last
+    axis. This is much faster than convolving each row separately.
+
+    .. versionchanged:: 0.9
+       Batched convolution of N-D ``data`` with a 1D ``kernel``.
 
     Parameters
     ----------
     data : array_like
-        First input, typically the data array
+        First input, typically the data array. If N-D, the last axis is
+        assumed to be time. For real-valued, floating-point inputs, the output
+        has the same precision as ``data`` (e.g., float32 stays float32).
+        Integer and boolean inputs are converted to float64.
     kernel : array_like
         Second input, typically the kernel
     mode : str {'full', 'valid', 'same'}, optional, default: 'full'
@@ -70,22 +218,100 @@ def conv(data, kernel, mode='full', method='fft'):
             The output is the same size as ``data``, centered with respect to
             the 'full' output.
 
-    method : str {'fft', 'sparse'}, optional, default: 'fft'
+    method : str, optional, default: 'fft'
         A string indicating the convolution method:
 
+        - ``auto``:
+            Use ``sparse`` if ``data`` has few nonzero time points and
+            ``kernel`` is 1D. Otherwise,
+            pick the faster of ``direct`` and ``fft`` based on the sizes of
+            ``data`` and ``kernel`` (see
+            ``scipy.signal.choose_conv_method``). The decision is cached.
+        - ``direct``:
+            Use direct convolution. Faster than FFT for short kernels.
         - ``fft``:
             Use the fast Fourier transform (FFT).
+        - ``oa``:
+            Use overlap-add FFT convolution. Faster than ``fft`` if ``data``
+            is much longer than ``kernel``.
+        - ``gpu``:
+            Use the FFT on the GPU (requires CuPy). Only supports real-valued
+            inputs and a 1D ``kernel``. Pays off for large batches of rows.
         - ``sparse``:
             Use the sparse convolution.
+
+        .. versionadded:: 0.9
+           The ``auto``, ``direct``, ``oa``, and ``gpu`` methods.
+    workers : int, optional, default: None
+        Number of CPU cores used to compute the FFTs of the ``fft`` and ``oa``
+        methods. -1 uses all available cores. If None, the SciPy default is
+        used (a single core, unless changed with ``scipy.fft.set_workers``).
+        Leave this at the default when calling ``conv`` from multiple threads
+        (e.g., inside ``parfor``).
+
+        .. versionadded:: 0.9
+    cache_kernel : bool, optional, default: False
+        If True, the FFT of a 1D ``kernel`` is cached by the ``fft`` and
+        ``gpu`` methods, which saves transforming the same kernel on
+        repeated calls (e.g., a fixed temporal kernel applied to many
+        stimuli). Each cached entry keeps a copy of the kernel plus its FFT,
+        zero-padded to the length of the full convolution (on the GPU for
+        ``gpu``). Up to 4 entries are kept, so the cache can hold on to a
+        lot of memory when ``data`` is long.
+
+        .. versionadded:: 0.9
     """
     if mode not in ['full', 'valid', 'same']:
         raise ValueError("Acceptable mode flags are 'full', 'valid', or "
                          "'same'.")
-    if method not in ['fft', 'sparse']:
-        raise ValueError("Acceptable methods are: 'fft', 'sparse'.")
-    if method.lower() == 'fft':
+    if method not in ['auto', 'direct', 'fft', 'oa', 'gpu', 'sparse']:
+        raise ValueError("Acceptable methods are: 'auto', 'direct', 'fft', "
+                         "'oa', 'gpu', 'sparse'.")
+    if workers is None:
+        workers = spfft.get_workers()
+    data = np.asarray(data)
+    kernel = np.asarray(kernel)
+    if np.isrealobj(data) and np.isrealobj(kernel):
+        # Keep the floating-point precision of the data, so that float32 data
+        # is convolved in (faster) single precision throughout. All other
+        # data (e.g., integers) is convolved in double precision:
+        if np.issubdtype(data.dtype, np.floating):
+            dtype = np.result_type(data.dtype, np.float32)
+        else:
+            dtype = np.float64
+        data = data.astype(dtype, copy=False)
+        kernel = kernel.astype(dtype, copy=False)
+    rowwise = kernel.ndim == 1
+    axes = None
+    if data.ndim > 1 and rowwise:
+        # Broadcast the kernel across all rows and transform only the last
+        # axis, so that all rows are convolved in a single call. The FFT is
+        # fastest if the rows (time axis) are contiguous in memory:
+        data = np.ascontiguousarray(data)
+        kernel = kernel.reshape((1,) * (data.ndim - 1) + kernel.shape)
+        axes = -1
+    if method.lower() == 'auto':
+        method = _auto_conv_method(data, kernel, mode, rowwise)
+    if method.lower() == 'direct':
+        conved = sps.convolve(data, kernel, mode, method='direct')
+    elif method.lower() == 'fft':
         # Use FFT: faster on non-sparse data
-        conved = sps.fftconvolve(data, kernel, mode)
+        if rowwise and np.isrealobj(data) and np.isrealobj(kernel):
+            # Round up to a fast FFT length and (optionally) cache the kernel:
+            conved = _fftconv(data, kernel, mode, workers=workers,
+                              cache_kernel=cache_kernel)
+        else:
+            with spfft.set_workers(workers):
+                conved = sps.fftconvolve(data, kernel, mode, axes=axes)
+    elif method.lower() == 'oa':
+        # Use overlap-add: faster on long data with a short kernel
+        with spfft.set_workers(workers):
+            conved = sps.oaconvolve(data, kernel, mode, axes=axes)
+    elif method.lower() == 'gpu':
+        if not rowwise or np.iscomplexobj(data) or np.iscomplexobj(kernel):
+            raise ValueError("The 'gpu' method requires real-valued inputs "
+                             "and a 1D kernel.")
+        conved = _gpuconv(data, kernel, mode, cache_kernel=cache_kernel)
     elif method.lower() == 'sparse':
         conved = _sparseconv(data, kernel, mode)
     return conved
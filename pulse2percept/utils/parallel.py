@@ -1,7 +1,6 @@
 """`parfor`"""
 import numpy as np
 import multiprocessing
-import joblib
 
 
 # JobLib and Dask are optional. Rather than trying to import them all over, try
@@ -163,6 +163,13 @@ def test_gamma():
             # Make sure peak sits correctly
             npt.assert_almost_equal(g.argmax() * tsample, tau * (n - 1))
 
+            # Make sure the tail is cut off right before the kernel drops
+            # below `tol` of its peak:
+            npt.assert_equal(g[-1] >= 0.01 * g.max(), True)
+            _, g_long = gamma(n, tau, tsample, tol=0.001)
+            npt.assert_equal(g_long.size > g.size, True)
+            npt.assert_equal(g_long[g.size] / g.max() < 0.01, True)
+
 
 class AreaCache(object):
 
@@ -1,6 +1,7 @@
 import numpy as np
 import numpy.testing as npt
 import pytest
+from scipy import signal as sps
 
 # Import whole module so we can reload it to test ImportErrors:
 from pulse2percept.utils import convolution, gamma
@@ -8,7 +9,7 @@ from importlib import reload
 
 
 @pytest.mark.parametrize('mode', ('full', 'valid', 'same'))
-@pytest.mark.parametrize('method', ('sparse', 'fft'))
+@pytest.mark.parametrize('method', ('sparse', 'fft', 'oa', 'direct', 'auto'))
 def test_conv(mode, method):
     reload(convolution)
     # time vector for stimulus (long)
@@ -34,3 +35,162 @@ def test_conv(mode, method):
         convolution.conv(gg, stim, mode="invalid")
     with pytest.raises(ValueError):
         convolution.conv(gg, stim, method="invalid")
+
+
+@pytest.mark.parametrize('mode', ('full', 'valid', 'same'))
+@pytest.mark.parametrize('method', ('sparse', 'fft', 'oa', 'direct', 'auto'))
+def test_conv_batched(mode, method):
+    tsample = 0.005 / 1000
+    _, gg = gamma(2, 0.0005, tsample)
+    # A (space x time) array, where each row has a different pulse train:
+    stim = np.zeros((3, 2, 2000))
+    stim[0, 0, ::200] = 1
+    stim[1, 0, 50::300] = -2
+    stim[2, 1, 10] = 3
+    conv = convolution.conv(stim, gg, mode=mode, method=method)
+    npconv = np.array([[np.convolve(row, gg, mode=mode) for row in rows]
+                       for rows in stim])
+    npt.assert_equal(conv.shape, npconv.shape)
+    npt.assert_almost_equal(conv, npconv)
+
+
+@pytest.mark.parametrize('method', ('fft', 'oa'))
+@pytest.mark.parametrize('workers', (None, 1, 2, -1))
+def test_conv_workers(method, workers):
+    tsample = 0.005 / 1000
+    _, gg = gamma(2, 0.0005, tsample)
+    stim = np.zeros((8, 1000))
+    stim[:, ::100] = 1
+    # The number of CPU cores used for the FFTs does not affect the result:
+    npt.assert_almost_equal(convolution.conv(stim, gg, mode='same',
+                                             method=method, workers=workers),
+                            convolution.conv(stim, gg, mode='same',
+                                             method='direct'))
+    # Also for N-D kernels (`scipy.signal.fftconvolve`):
+    npt.assert_almost_equal(convolution.conv(stim, np.ones((2, 3)),
+                                             method=method, workers=workers),
+                            convolution.conv(stim, np.ones((2, 3)),
+                                             method='direct'))
+
+
+def test_conv_fft_kernel_cache():
+    reload(convolution)
+    tsample = 0.005 / 1000
+    _, gg = gamma(3, 0.0005, tsample)
+    stim = np.zeros(1000)
+    stim[::100] = 1
+    # By default, nothing is cached:
+    conv = convolution.conv(stim, gg, mode='same', method='fft')
+    npt.assert_almost_equal(conv, np.convolve(stim, gg, mode='same'))
+    npt.assert_equal(convolution._rfft_kernel.cache_info().currsize, 0)
+    # If requested, the FFT of the kernel should only be computed once:
+    for _ in range(3):
+        conv = convolution.conv(stim, gg, mode='same', method='fft',
+                                cache_kernel=True)
+        npt.assert_almost_equal(conv, np.convolve(stim, gg, mode='same'))
+    npt.assert_equal(convolution._rfft_kernel.cache_info().misses, 1)
+    npt.assert_equal(convolution._rfft_kernel.cache_info().hits, 2)
+    # Only a few kernels are kept:
+    for klen in range(10, 20):
+        convolution.conv(stim, gg[:klen], method='fft', cache_kernel=True)
+    npt.assert_equal(convolution._rfft_kernel.cache_info().currsize, 4)
+    # Kernel longer than data:
+    npt.assert_almost_equal(convolution.conv(gg[:20], stim, mode='valid'),
+                            np.convolve(gg[:20], stim, mode='valid'))
+
+
+@pytest.mark.parametrize('mode', ('full', 'valid', 'same'))
+def test_conv_gpu(mode):
+    pytest.importorskip('cupy')
+    reload(convolution)
+    tsample = 0.005 / 1000
+    _, gg = gamma(2, 0.0005, tsample)
+    stim = np.zeros((4, 1000))
+    stim[:, ::100] = 1
+    npt.assert_almost_equal(convolution.conv(stim, gg, mode=mode,
+                                             method='gpu'),
+                            convolution.conv(stim, gg, mode=mode))
+    npt.assert_equal(convolution._rfft_kernel_gpu.cache_info().currsize, 0)
+    # If requested, the FFT of the kernel should only be computed once:
+    for _ in range(3):
+        npt.assert_almost_equal(convolution.conv(stim, gg, mode=mode,
+                                                 method='gpu',
+                                                 cache_kernel=True),
+                                convolution.conv(stim, gg, mode=mode))
+    npt.assert_equal(convolution._rfft_kernel_gpu.cache_info().misses, 1)
+    npt.assert_equal(convolution._rfft_kernel_gpu.cache_info().hits, 2)
+    with pytest.raises(ValueError):
+        convolution.conv(stim, np.ones((2, 2)), mode=mode, method='gpu')
+
+
+@pytest.mark.skipif(convolution.has_cupy, reason='CuPy is installed')
+def test_conv_gpu_missing():
+    reload(convolution)
+    stim = np.zeros((4, 1000))
+    stim[:, ::100] = 1
+    with pytest.raises(ImportError):
+        convolution.conv(stim, np.ones(10), method='gpu')
+    with pytest.raises(ValueError):
+        convolution.conv(stim, np.ones((2, 2)), method='gpu')
+
+
+@pytest.mark.parametrize('method', ('sparse', 'fft', 'oa', 'direct', 'auto'))
+@pytest.mark.parametrize('dtype', (np.float32, np.float64))
+def test_conv_dtype(method, dtype):
+    tsample = 0.005 / 1000
+    _, gg = gamma(2, 0.0005, tsample)
+    stim = np.zeros((2, 1000), dtype=dtype)
+    stim[:, ::100] = 1
+    # The precision of the data is preserved, even though `gg` is float64:
+    conv = convolution.conv(stim, gg, mode='same', method=method)
+    npt.assert_equal(conv.dtype, dtype)
+    npt.assert_allclose(conv[0], np.convolve(stim[0], gg, mode='same'),
+                        rtol=1e-4, atol=1e-3)
+    # Integer and boolean data is convolved in double precision:
+    for int_type in (np.uint8, np.int8, np.int16, bool):
+        conv = convolution.conv(stim.astype(int_type), gg.astype(dtype),
+                                mode='same', method=method)
+        npt.assert_equal(conv.dtype, np.float64)
+        npt.assert_allclose(conv[0], np.convolve(stim[0], gg, mode='same'),
+                            rtol=1e-4, atol=1e-3)
+
+
+def test_conv_auto():
+    reload(convolution)
+    stim = np.zeros(10000)
+    stim[::100] = 1
+    dense = np.random.rand(10000)
+    # Sparse data: sparse convolution, unless the kernel is very long. The
+    # choice between 'direct' and 'fft' is up to SciPy, so we only check that
+    # the result is correct:
+    for data, klen, sparse in [(stim, 3, True), (stim, 5000, False),
+                               (dense, 3, False), (dense, 5000, False)]:
+        kernel = np.ones(klen)
+        npt.assert_almost_equal(convolution.conv(data, kernel, mode='same',
+                                                 method='auto'),
+                                np.convolve(data, kernel, mode='same'))
+        method = convolution._auto_conv_method(data, kernel, 'same', True)
+        npt.assert_equal(method == 'sparse', sparse)
+
+    # Sparse data with an N-D kernel: the sparse convolution only supports 1D
+    # kernels along the last axis:
+    img = np.zeros((50, 400))
+    img[10, 5] = 1
+    img[30, 200] = 2
+    kernel = np.ones((3, 3))
+    for mode in ['full', 'valid', 'same']:
+        conv = convolution.conv(img, kernel, mode=mode, method='auto')
+        expected = sps.fftconvolve(img, kernel, mode=mode)
+        npt.assert_equal(conv.shape, expected.shape)
+        npt.assert_almost_equal(conv, expected)
+
+    # Sparse data with a kernel that is longer than the data:
+    data = np.zeros(100)
+    data[3] = 1
+    kernel = np.random.rand(300)
+    for method in ['auto', 'sparse']:
+        for mode in ['full', 'valid', 'same']:
+            conv = convolution.conv(data, kernel, mode=mode, method=method)
+            expected = sps.fftconvolve(data, kernel, mode=mode)
+            npt.assert_equal(conv.shape, expected.shape)
+            npt.assert_almost_equal(conv, expected)